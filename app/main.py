@@ -1,6 +1,8 @@
+import time
+START_TIME = time.perf_counter()
+
 import os
 import sys
-import time
 from typing import List
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,93 +10,60 @@ PROJECT_ROOT = os.path.dirname(THIS_DIR)
 SRC_DIR = os.path.join(PROJECT_ROOT, "src")
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 DATA_PROCESSED_DIR = os.path.join(PROJECT_ROOT, "data_processed")
+VSM_THREADS = 1  # > 1: skoring VSM paralel per blok kolom dokumen
+LSA_N_PROBE = 1  # jumlah inverted list IVF yang diperiksa (lebih besar: recall naik, latensi naik)
 
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
 
-try:
-    from preprocess import initialize_preprocessing, get_processed_corpus, preprocess_query
-except Exception as e:
-    try:
-        from preprocess import initialize_preprocessing, get_processed_corpus as _gpc, preprocess_query as _pq
-        initialize_preprocessing = initialize_preprocessing
-        get_processed_corpus = _gpc
-        preprocess_query = _pq
-    except Exception:
-        print("Warning: Tidak dapat mengimpor fungsi dari preprocess.py. Pastikan file src/preprocess.py ada dan memiliki fungsi:")
-        print("  - initialize_preprocessing()")
-        print("  - get_processed_corpus()")
-        print("  - preprocess_query(query, stemmer, stop_words)")
-        print("Continuing; some features may not work.")
-        initialize_preprocessing = None
-        get_processed_corpus = None
-        preprocess_query = None
-
-try:
-    from boolean_ir import build_inverted_index, build_incidence_matrix, boolean_retrieve, calculate_precision_recall
-except Exception:
-    try:
-        from boolean_ir import build_inverted_index, build_incidence_matrix, boolean_retrieve, calculate_precision_recall
-    except Exception:
-        build_inverted_index = None
-        build_incidence_matrix = None
-        boolean_retrieve = None
-        calculate_precision_recall = None
-        print("Warning: boolean_ir.py import error. Boolean features may not work.")
-
-try:
-    from vsm_ir import calculate_tf_idf, query_to_tfidf_vector, rank_documents, load_processed_documents as vsm_load_processed
-except Exception:
-    try:
-        from vsm_ir import calculate_tf_idf, query_to_tfidf_vector, rank_documents
-        vsm_load_processed = None
-    except Exception:
-        calculate_tf_idf = None
-        query_to_tfidf_vector = None
-        rank_documents = None
-        vsm_load_processed = None
-        print("Warning: vsm_ir.py import error. VSM features may not work.")
-
-try:
-    from eval import evaluate_search_engine as eval_search
-except Exception:
-    try:
-        from eval import evaluate as eval_search
-    except Exception:
-        eval_search = None
-        print("Warning: eval.py import error. Evaluation features may not work.")
+from lazy_import import lazy_function, print_startup_report
+
+# Modul src/ (beserta numpy, scipy, sklearn, Sastrawi) baru di-import saat fiturnya dipakai;
+# jika import gagal, ImportError ditangani per menu di main_menu()
+initialize_preprocessing = lazy_function("preprocess", "initialize_preprocessing")
+get_processed_corpus = lazy_function("preprocess", "get_processed_corpus")
+preprocess_query = lazy_function("preprocess", "preprocess_query")
+
+build_inverted_index = lazy_function("boolean_ir", "build_inverted_index")
+build_incidence_matrix = lazy_function("boolean_ir", "build_incidence_matrix")
+boolean_retrieve = lazy_function("boolean_ir", "boolean_retrieve")
+calculate_precision_recall = lazy_function("boolean_ir", "calculate_precision_recall")
+
+calculate_tf_idf = lazy_function("vsm_ir", "calculate_tf_idf")
+query_to_tfidf_vector = lazy_function("vsm_ir", "query_to_tfidf_vector")
+rank_documents = lazy_function("vsm_ir", "rank_documents")
+rank_top_k = lazy_function("vsm_ir", "rank_top_k")
+vsm_load_processed = lazy_function("vsm_ir", "load_processed_documents")
+
+build_lsa_embeddings = lazy_function("lsa_ir", "build_lsa_embeddings")
+query_to_lsa_vector = lazy_function("lsa_ir", "query_to_lsa_vector")
+build_ivf_index = lazy_function("lsa_ir", "build_ivf_index")
+ivf_search = lazy_function("lsa_ir", "ivf_search")
+fuse_rankings = lazy_function("lsa_ir", "fuse_rankings")
+
+get_query_analyzer = lazy_function("query_analyzer", "get_query_analyzer")
+plan_to_tfidf_vector = lazy_function("query_analyzer", "plan_to_tfidf_vector")
+
+eval_search = lazy_function("eval", "evaluate_search_engine")
+
+build_index_report = lazy_function("index_stats", "build_index_report")
+print_index_report = lazy_function("index_stats", "print_index_report")
 
 def ensure_dirs():
     os.makedirs(DATA_DIR, exist_ok=True)
     os.makedirs(DATA_PROCESSED_DIR, exist_ok=True)
 
 def run_preprocessing_and_save():
-    """Menjalankan get_processed_corpus() lalu menyimpan ke data_processed/ sebagai CLEAN_*.txt."""
-    if get_processed_corpus is None:
-        print("Preprocess module tidak tersedia. Jalankan/memperbaiki src/preprocess.py")
-        return
-
+    """Menjalankan get_processed_corpus(); hasil disimpan ke data_processed/ sebagai CLEAN_*.txt (dengan cache)."""
     print("Memulai preprocessing korpus...")
     start = time.time()
     processed = get_processed_corpus()
     elapsed = time.time() - start
-    print(f"Preprocessing selesai dalam {elapsed:.2f} detik. Menyimpan hasil ke '{DATA_PROCESSED_DIR}' ...")
-
-    os.makedirs(DATA_PROCESSED_DIR, exist_ok=True)
-    count = 0
-    for doc_id, tokens in processed.items():
-        out_name = f"CLEAN_{doc_id}"
-        out_path = os.path.join(DATA_PROCESSED_DIR, out_name)
-        try:
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(" ".join(tokens))
-            count += 1
-        except Exception as ex:
-            print(f"  Gagal menulis {out_path}: {ex}")
-    print(f"Selesai: {count} file ditulis ke data_processed/.")
+    # get_processed_corpus() sudah menulis CLEAN_*.txt (dokumen yang tidak berubah dilewati)
+    print(f"Preprocessing selesai dalam {elapsed:.2f} detik: {len(processed)} dokumen di '{DATA_PROCESSED_DIR}'.")
 
 def build_indices_from_processed():
-    """Membaca files CLEAN_*.txt, membangun inverted index dan incidence matrix."""
+    """Membaca dokumen terproses (corpus.bin atau CLEAN_*.txt), membangun inverted index dan incidence matrix."""
     ensure_dirs()
     if not os.path.isdir(DATA_PROCESSED_DIR):
         print("Folder data_processed tidak ditemukan. Jalankan preprocessing dulu.")
@@ -105,51 +74,41 @@ def build_indices_from_processed():
         print("Tidak ada file CLEAN_*.txt di data_processed/. Jalankan preprocessing dulu.")
         return
 
-    documents = {}
-    doc_id_map = {}
-    all_terms = set()
-    for i, fn in enumerate(file_list):
-        path = os.path.join(DATA_PROCESSED_DIR, fn)
-        with open(path, "r", encoding="utf-8") as f:
-            toks = f.read().split()
-        doc_id = f"D{i+1}"
-        documents[doc_id] = toks
-        doc_id_map[doc_id] = fn.replace("CLEAN_", "").replace(".txt", "")
-        all_terms.update(toks)
-    vocabulary = sorted(list(all_terms))
+    documents, doc_id_map, vocabulary, _ = vsm_load_processed(DATA_PROCESSED_DIR)
 
     print(f"Loaded {len(documents)} documents, vocabulary size: {len(vocabulary)}")
 
     inverted = None
     incidence = None
-    if build_inverted_index is not None:
-        try:
-            inverted = build_inverted_index(documents)
-            print(f"Inverted index built ({len(inverted)} terms).")
-        except Exception as e:
-            print("Gagal membangun inverted index:", e)
+    try:
+        inverted = build_inverted_index(documents)
+        print(f"Inverted index built ({len(inverted)} terms).")
+    except Exception as e:
+        print("Gagal membangun inverted index:", e)
 
-    if build_incidence_matrix is not None:
-        try:
-            incidence, doc_ids = build_incidence_matrix(documents, vocabulary)
-            print(f"Incidence matrix shape: {incidence.shape}")
-        except Exception as e:
-            print("Gagal membangun incidence matrix:", e)
+    try:
+        incidence, doc_ids = build_incidence_matrix(documents, vocabulary)
+        print(f"Incidence matrix shape: {incidence.shape}")
+    except Exception as e:
+        print("Gagal membangun incidence matrix:", e)
 
     return documents, doc_id_map, vocabulary, inverted, incidence
 
+def load_query_analyzer():
+    """Mengambil QueryAnalyzer bersama (stemmer & stopwords hanya dimuat sekali per proses)."""
+    try:
+        return get_query_analyzer()
+    except Exception as e:
+        print("Peringatan: gagal inisialisasi preprocessing:", e)
+        return None
+
 def boolean_query_cli(inverted_index, all_doc_ids):
     """Loop interaktif untuk query Boolean dengan preprocessing (stemmer & stopwords)."""
-    if inverted_index is None or boolean_retrieve is None:
-        print("Boolean functionality tidak tersedia.")
+    if inverted_index is None:
+        print("Inverted index tidak tersedia; query Boolean dibatalkan.")
         return
 
-    stemmer, stop_words = (None, None)
-    if initialize_preprocessing:
-        try:
-            stemmer, stop_words = initialize_preprocessing()
-        except Exception as e:
-            print("Peringatan: gagal inisialisasi preprocessing:", e)
+    analyzer = load_query_analyzer()
 
     print("Masukkan query Boolean (misal: 'kriptografi AND keamanan', 'NOT proyek', 'sistem'). Ketik 'back' untuk kembali.")
     while True:
@@ -160,8 +119,8 @@ def boolean_query_cli(inverted_index, all_doc_ids):
             break
 
         try:
-            if stemmer and stop_words:
-                res = boolean_retrieve(q, inverted_index, all_doc_ids, stemmer, stop_words)
+            if analyzer is not None:
+                res = boolean_retrieve(q, inverted_index, all_doc_ids, None, None, analyzer=analyzer)
             else:
                 res = boolean_retrieve(q, inverted_index, all_doc_ids)
         except TypeError:
@@ -172,17 +131,17 @@ def boolean_query_cli(inverted_index, all_doc_ids):
 
         print("Hasil:", res)
 
+def build_query_vector(q, analyzer, term_to_idx, idf_vector):
+    """Mengembalikan (teks query terproses, vektor TF-IDF query); tanpa analyzer, query hanya di-lowercase."""
+    if analyzer is not None:
+        plan = analyzer.compile(q, term_to_idx, idf_vector)
+        return " ".join(plan.tokens), plan_to_tfidf_vector(plan, len(term_to_idx))
+    q_text = " ".join(q.lower().split())
+    return q_text, query_to_tfidf_vector(q_text, term_to_idx, idf_vector)
+
 def vsm_query_cli(tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map):
     """Simple loop to run VSM queries (query will be preprocessed inside this script)."""
-    if calculate_tf_idf is None or rank_documents is None or query_to_tfidf_vector is None:
-        print("VSM functionality tidak tersedia.")
-        return
-    stemmer, stop_words = (None, None)
-    if initialize_preprocessing:
-        try:
-            stemmer, stop_words = initialize_preprocessing()
-        except Exception:
-            stemmer, stop_words = (None, None)
+    analyzer = load_query_analyzer()
 
     print("Masukkan query untuk VSM. Ketik 'back' untuk kembali.")
     while True:
@@ -192,19 +151,10 @@ def vsm_query_cli(tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map):
         if q.lower() in ("exit", "quit", "back"):
             break
 
-        if preprocess_query and stemmer is not None:
-            try:
-                tokens = preprocess_query(q, stemmer, stop_words)
-            except Exception:
-                tokens = q.lower().split()
-        else:
-            tokens = q.lower().split()
-
-        q_text = " ".join(tokens)
-        qvec = query_to_tfidf_vector(q_text, term_to_idx, idf_vector)
-        ranking = rank_documents(qvec, tfidf_matrix, doc_ids)
+        q_text, qvec = build_query_vector(q, analyzer, term_to_idx, idf_vector)
+        ranking = rank_top_k(qvec, tfidf_matrix, doc_ids, k=5, n_threads=VSM_THREADS)
         print(f"\nTop results for: '{q_text}'")
-        for rank, (doc_id, score) in enumerate(ranking[:5], 1):
+        for rank, (doc_id, score) in enumerate(ranking, 1):
             print(f"{rank}. {doc_id} ({doc_map.get(doc_id,'-')})  score={score:.6f}")
         print("-" * 40)
 
@@ -217,10 +167,6 @@ def run_vsm_and_return():
         return None
     documents, doc_map, vocabulary, inverted, incidence = res
 
-    if calculate_tf_idf is None:
-        print("Fungsi calculate_tf_idf tidak tersedia pada vsm_ir.py")
-        return None
-
     tfidf_matrix, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(documents, vocabulary)
     print("TF-IDF matrix built:", tfidf_matrix.shape)
     return tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map
@@ -245,11 +191,8 @@ def evaluate_sample_queries():
         retrieved = [d for d, s in ranking]
         print(f"\nQuery: {q}")
         print("Top 5:", ranking[:5])
-        if eval_search:
-            P, R, F1, nDCG = eval_search(retrieved, gold, k=5)
-            print(f" Eval -> P:{P:.4f}, R:{R:.4f}, F1:{F1:.4f}, nDCG:{nDCG:.4f}")
-        else:
-            print("Eval module not available. Skipping metrics.")
+        P, R, F1, nDCG = eval_search(retrieved, gold, k=5)
+        print(f" Eval -> P:{P:.4f}, R:{R:.4f}, F1:{F1:.4f}, nDCG:{nDCG:.4f}")
 
 def interactive_vsm_search_loop():
     vsm_res = run_vsm_and_return()
@@ -258,8 +201,58 @@ def interactive_vsm_search_loop():
     tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map = vsm_res
     vsm_query_cli(tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map)
 
-def main_menu():
+def lsa_query_cli(tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map, n_probe=LSA_N_PROBE):
+    """Loop interaktif untuk pencarian LSA (dense) via indeks IVF, digabung dengan ranking TF-IDF."""
+    doc_embeddings, svd = build_lsa_embeddings(tfidf_matrix)
+    ivf_index = build_ivf_index(doc_embeddings)
+    print(f"LSA embeddings: {doc_embeddings.shape}, IVF lists: {len(ivf_index['centroids'])}, n_probe={n_probe}")
+
+    analyzer = load_query_analyzer()
+
+    print("Masukkan query untuk LSA. Ketik 'back' untuk kembali.")
+    while True:
+        q = input("LSA query> ").strip()
+        if not q:
+            continue
+        if q.lower() in ("exit", "quit", "back"):
+            break
+
+        q_text, qvec = build_query_vector(q, analyzer, term_to_idx, idf_vector)
+        if qvec.nnz == 0:
+            # Tanpa term yang dikenal, embedding query nol dan hasil IVF hanya acak
+            print(f"Tidak ada term query '{q_text}' di vocabulary. Coba kata lain." if q_text
+                  else "Query hanya berisi stopword. Coba kata lain.")
+            continue
+        dense = ivf_search(query_to_lsa_vector(qvec, svd), ivf_index, doc_ids, k=5, n_probe=n_probe)
+        # Skor <= 0 dibuang oleh fuse_rankings
+        sparse = rank_top_k(qvec, tfidf_matrix, doc_ids, k=5, n_threads=VSM_THREADS)
+        fused = fuse_rankings(sparse, dense, k=5)
+        print(f"\nTop results (LSA + TF-IDF fusion) for: '{q_text}'")
+        for rank, (doc_id, score) in enumerate(fused, 1):
+            print(f"{rank}. {doc_id} ({doc_map.get(doc_id,'-')})  rrf={score:.6f}")
+        print("-" * 40)
+
+def show_index_report():
+    """Statistik index (postings, memori, estimasi biaya query) dan deteksi index basi terhadap data/."""
+    res = build_indices_from_processed()
+    if not res:
+        return
+    documents, doc_map, vocabulary, inverted, incidence = res
+    tfidf_matrix, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(documents, vocabulary)
+
+    q = input("Query untuk estimasi biaya (enter untuk lewati): ").strip()
+    query_tokens = None
+    if q:
+        analyzer = load_query_analyzer()
+        query_tokens = analyzer.analyze(q) if analyzer is not None else q.lower().split()
+
+    report = build_index_report(inverted, tfidf_matrix, incidence, len(documents), query_tokens,
+                                data_dir=DATA_DIR, processed_dir=DATA_PROCESSED_DIR)
+    print_index_report(report)
+
+def main_menu(profile_startup=False):
     ensure_dirs()
+    first_prompt_time = None
     while True:
         print("\n=== UTS STKI - MAIN MENU ===")
         print("1) Preprocess all documents (generate data_processed/CLEAN_*.txt)")
@@ -268,40 +261,56 @@ def main_menu():
         print("4) Build VSM (TF-IDF) and run example query")
         print("5) Interactive VSM search (top-K)")
         print("6) Run evaluation examples (Precision/Recall/F1/nDCG)")
+        print("7) Interactive LSA (dense/ANN) search + fusion")
+        print("8) Index statistics & health report")
         print("0) Exit")
+        if first_prompt_time is None:
+            first_prompt_time = time.perf_counter()
         choice = input("Pilih nomor: ").strip()
-        if choice == "1":
-            run_preprocessing_and_save()
-        elif choice == "2":
-            build_indices_from_processed()
-        elif choice == "3":
-            res = build_indices_from_processed()
-            if res:
-                documents, doc_map, vocabulary, inverted, incidence = res
-                all_doc_ids = sorted(documents.keys())
-                boolean_query_cli(inverted, all_doc_ids)
-        elif choice == "4":
-            vsm_res = run_vsm_and_return()
-            if vsm_res:
-                tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map = vsm_res
-                q = input("Masukkan contoh query VSM (atau enter untuk 'sistem terdistribusi'): ").strip() or "sistem terdistribusi"
-                qvec = query_to_tfidf_vector(q, term_to_idx, idf_vector)
-                ranking = rank_documents(qvec, tfidf_matrix, doc_ids)
-                print("Top 5 results:")
-                for r, (doc_id, score) in enumerate(ranking[:5], 1):
-                    print(f" {r}. {doc_id} ({doc_map.get(doc_id)}) score={score:.6f}")
-        elif choice == "5":
-            interactive_vsm_search_loop()
-        elif choice == "6":
-            evaluate_sample_queries()
-        elif choice == "0":
-            print("Keluar. Sampai jumpa.")
-            break
-        else:
-            print("Pilihan tidak dikenali. Coba lagi.")
+        try:
+            if choice == "1":
+                run_preprocessing_and_save()
+            elif choice == "2":
+                build_indices_from_processed()
+            elif choice == "3":
+                res = build_indices_from_processed()
+                if res:
+                    documents, doc_map, vocabulary, inverted, incidence = res
+                    all_doc_ids = sorted(documents.keys())
+                    boolean_query_cli(inverted, all_doc_ids)
+            elif choice == "4":
+                vsm_res = run_vsm_and_return()
+                if vsm_res:
+                    tfidf_matrix, idf_vector, term_to_idx, doc_ids, doc_map = vsm_res
+                    q = input("Masukkan contoh query VSM (atau enter untuk 'sistem terdistribusi'): ").strip() or "sistem terdistribusi"
+                    qvec = query_to_tfidf_vector(q, term_to_idx, idf_vector)
+                    ranking = rank_documents(qvec, tfidf_matrix, doc_ids)
+                    print("Top 5 results:")
+                    for r, (doc_id, score) in enumerate(ranking[:5], 1):
+                        print(f" {r}. {doc_id} ({doc_map.get(doc_id)}) score={score:.6f}")
+            elif choice == "5":
+                interactive_vsm_search_loop()
+            elif choice == "6":
+                evaluate_sample_queries()
+            elif choice == "7":
+                vsm_res = run_vsm_and_return()
+                if vsm_res:
+                    lsa_query_cli(*vsm_res)
+            elif choice == "8":
+                show_index_report()
+            elif choice == "0":
+                print("Keluar. Sampai jumpa.")
+                break
+            else:
+                print("Pilihan tidak dikenali. Coba lagi.")
+        except ImportError as e:
+            print(f"Fitur tidak tersedia (gagal import modul): {e}")
+
+    if profile_startup:
+        print_startup_report(first_prompt_time, START_TIME)
 
 if __name__ == "__main__":
     try:
-        main_menu()
+        main_menu(profile_startup="--profile-startup" in sys.argv[1:])
     except KeyboardInterrupt:
         print("\nDihentikan oleh pengguna. Keluar.")
\ No newline at end of file
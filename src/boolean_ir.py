@@ -2,10 +2,17 @@ import os
 from collections import Counter
 import numpy as np
 from preprocess import initialize_preprocessing, preprocess_query
+from query_analyzer import compile_boolean_plan
+from corpus_store import CORPUS_FILENAME, is_corpus_stale, load_documents_from_binary
 
 PROCESSED_DIR = 'data_processed'
 
 def load_processed_documents(directory):
+    # Korpus biner dipakai jika masih sesuai dengan file CLEAN_*.txt; jika tidak, baca per file
+    if not is_corpus_stale(directory):
+        documents, doc_id_map, vocabulary, _ = load_documents_from_binary(os.path.join(directory, CORPUS_FILENAME))
+        return documents, doc_id_map, vocabulary
+
     documents = {}
     doc_id_map = {}
     all_terms = set()
@@ -55,27 +62,38 @@ def intersect(a, b): return sorted(list(set(a) & set(b)))
 def union(a, b): return sorted(list(set(a) | set(b)))
 def complement(a, all_docs): return sorted(list(set(all_docs) - set(a)))
 
-def boolean_retrieve(query_str, inverted_index, all_doc_ids, stemmer, stop_words):
-    processed_query = preprocess_query(query_str, stemmer, stop_words)
+def boolean_retrieve_plan(boolean_plan, inverted_index, all_doc_ids):
+    if boolean_plan is None:
+        return None
+
+    operator = boolean_plan[0]
+    if operator == 'TERM':
+        return inverted_index.get(boolean_plan[1], [])
+    if operator == 'NOT':
+        return complement(inverted_index.get(boolean_plan[1], []), all_doc_ids)
+
+    postings1 = inverted_index.get(boolean_plan[1], [])
+    postings2 = inverted_index.get(boolean_plan[2], [])
+    if operator == 'AND':
+        return intersect(postings1, postings2)
+    if operator == 'OR':
+        return union(postings1, postings2)
+    return None
+
+def boolean_retrieve(query_str, inverted_index, all_doc_ids, stemmer, stop_words, analyzer=None):
+    if analyzer is not None:
+        # Token dan plan Boolean diambil dari cache analyzer
+        processed_query = analyzer.analyze(query_str)
+        boolean_plan = analyzer.boolean_plan(query_str)
+    else:
+        processed_query = preprocess_query(query_str, stemmer, stop_words)
+        boolean_plan = compile_boolean_plan(processed_query)
     if not processed_query:
         return []
 
-    if len(processed_query) == 2 and processed_query[0].upper() == 'NOT':
-        term = processed_query[1]
-        postings = inverted_index.get(term, [])
-        return complement(postings, all_doc_ids)
-    
-    if len(processed_query) == 3:
-        term1, operator, term2 = processed_query[0], processed_query[1].upper(), processed_query[2]
-        postings1 = inverted_index.get(term1, [])
-        postings2 = inverted_index.get(term2, [])
-        if operator == 'AND':
-            return intersect(postings1, postings2)
-        elif operator == 'OR':
-            return union(postings1, postings2)
-
-    if len(processed_query) == 1:
-        return inverted_index.get(processed_query[0], [])
+    result = boolean_retrieve_plan(boolean_plan, inverted_index, all_doc_ids)
+    if result is not None:
+        return result
     
     print(f"Peringatan: Query '{query_str}' tidak dikenali.")
     return []
@@ -0,0 +1,168 @@
+import os
+import sys
+import json
+import struct
+import numpy as np
+from scipy.sparse import csc_matrix
+
+PROCESSED_DIR = 'data_processed'
+CORPUS_FILENAME = 'corpus.bin'
+
+# Layout file (little-endian):
+#   magic (8 byte) | versi (uint32) | panjang header JSON (uint32) | header JSON | padding ke 8 byte
+#   offsets dokumen (uint64, n_docs + 1) | token stream (uint32, n_tokens)
+MAGIC = b'STKICORP'
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct('<8sII')
+
+def _align(n, alignment=8):
+    return (n + alignment - 1) // alignment * alignment
+
+def write_binary_corpus(named_documents, path):
+    vocabulary = sorted({t for tokens in named_documents.values() for t in tokens})
+    term_to_idx = {term: i for i, term in enumerate(vocabulary)}
+    doc_names = list(named_documents.keys())
+
+    offsets = np.zeros(len(doc_names) + 1, dtype='<u8')
+    for j, name in enumerate(doc_names):
+        offsets[j + 1] = offsets[j] + len(named_documents[name])
+    token_stream = np.fromiter(
+        (term_to_idx[t] for name in doc_names for t in named_documents[name]),
+        dtype='<u4', count=int(offsets[-1]),
+    )
+
+    header = json.dumps({
+        'n_docs': len(doc_names),
+        'n_tokens': int(offsets[-1]),
+        'doc_names': doc_names,
+        'vocabulary': vocabulary,
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_start - _PREFIX.size - len(header)))
+        f.write(offsets.tobytes())
+        f.write(token_stream.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+def list_clean_files(directory):
+    return sorted([f for f in os.listdir(directory) if f.startswith('CLEAN_') and f.endswith('.txt')])
+
+def is_corpus_stale(directory, corpus_path=None):
+    # Basi jika belum ada, daftar dokumennya berbeda dengan file CLEAN_*.txt (file ditambah atau
+    # dihapus menggeser doc_id), atau lebih lama dari file CLEAN_*.txt terbaru
+    if corpus_path is None:
+        corpus_path = os.path.join(directory, CORPUS_FILENAME)
+    if not os.path.exists(corpus_path):
+        return True
+    try:
+        header, _ = read_corpus_header(corpus_path)
+    except (OSError, ValueError, struct.error):
+        return True
+    clean_files = list_clean_files(directory)
+    if header['doc_names'] != [f.replace('CLEAN_', '').replace('.txt', '') for f in clean_files]:
+        return True
+    if not clean_files:
+        return False
+    newest_clean = max(os.path.getmtime(os.path.join(directory, f)) for f in clean_files)
+    return os.path.getmtime(corpus_path) < newest_clean
+
+def convert_clean_files(directory, output_path=None):
+    if output_path is None:
+        output_path = os.path.join(directory, CORPUS_FILENAME)
+
+    file_list = list_clean_files(directory)
+    named_documents = {}
+    for filename in file_list:
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            named_documents[filename.replace('CLEAN_', '').replace('.txt', '')] = f.read().split()
+
+    return write_binary_corpus(named_documents, output_path)
+
+def read_corpus_header(path):
+    # Hanya prefix dan header JSON yang dibaca; token stream tidak disentuh
+    with open(path, 'rb') as f:
+        magic, version, header_len = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} bukan file korpus biner yang valid (versi {FORMAT_VERSION}).")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    return header, header_len
+
+def load_binary_corpus(path):
+    header, header_len = read_corpus_header(path)
+    n_docs, n_tokens = header['n_docs'], header['n_tokens']
+    offsets_start = _align(_PREFIX.size + header_len)
+    tokens_start = offsets_start + 8 * (n_docs + 1)
+
+    offsets = np.memmap(path, dtype='<u8', mode='r', offset=offsets_start, shape=(n_docs + 1,))
+    if n_tokens:
+        tokens = np.memmap(path, dtype='<u4', mode='r', offset=tokens_start, shape=(n_tokens,))
+    else:
+        tokens = np.zeros(0, dtype='<u4')
+
+    return {
+        'tokens': tokens,
+        'offsets': offsets,
+        'vocabulary': header['vocabulary'],
+        'doc_names': header['doc_names'],
+    }
+
+def document_term_ids(corpus, j):
+    offsets = corpus['offsets']
+    return corpus['tokens'][offsets[j]:offsets[j + 1]]
+
+def load_documents_from_binary(path):
+    # Kompatibel dengan vsm_ir.load_processed_documents (doc_id D1..DN sesuai urutan nama file)
+    corpus = load_binary_corpus(path)
+    vocabulary = corpus['vocabulary']
+    # Term ID -> string lewat indexing array objek, tanpa loop Python per token
+    terms = np.array(vocabulary, dtype=object)
+    documents, doc_id_map, raw_text_map = {}, {}, {}
+
+    for j, name in enumerate(corpus['doc_names']):
+        doc_id = f'D{j+1}'
+        tokens = terms[document_term_ids(corpus, j)].tolist()
+        documents[doc_id] = tokens
+        doc_id_map[doc_id] = name
+        raw_text_map[doc_id] = ' '.join(tokens)[:120] + '...'
+
+    return documents, doc_id_map, vocabulary, raw_text_map
+
+def calculate_tf_idf_from_binary(corpus):
+    # Hasil sama dengan vsm_ir.calculate_tf_idf, tetapi langsung dari term ID tanpa string
+    vocabulary = corpus['vocabulary']
+    n_docs = len(corpus['doc_names'])
+    V = len(vocabulary)
+    # Urutan kolom mengikuti sorted(doc_id) seperti di calculate_tf_idf
+    doc_ids = sorted(f'D{j+1}' for j in range(n_docs))
+    column_of = {doc_id: c for c, doc_id in enumerate(doc_ids)}
+
+    rows, cols, data = [], [], []
+    df = np.zeros(V, dtype=np.int64)
+    for j in range(n_docs):
+        term_ids, counts = np.unique(document_term_ids(corpus, j), return_counts=True)
+        df[term_ids] += 1
+        rows.append(term_ids)
+        cols.append(np.full(term_ids.size, column_of[f'D{j+1}']))
+        data.append(1 + np.log10(counts))
+
+    idf_vector = np.log10(n_docs / np.maximum(df, 1))
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+    data = np.concatenate(data) if data else np.zeros(0)
+
+    tfidf_matrix = csc_matrix((data * idf_vector[rows], (rows, cols)), shape=(V, n_docs))
+    term_to_idx = {term: i for i, term in enumerate(vocabulary)}
+    return tfidf_matrix, idf_vector, term_to_idx, doc_ids
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else PROCESSED_DIR
+    output_path = convert_clean_files(directory)
+    corpus = load_binary_corpus(output_path)
+
+    print(f"Korpus biner ditulis ke {output_path} ({os.path.getsize(output_path)} byte).")
+    print(f"Dokumen: {len(corpus['doc_names'])} | Token: {len(corpus['tokens'])} | Vocabulary: {len(corpus['vocabulary'])}")
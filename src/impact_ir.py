@@ -0,0 +1,222 @@
+import sys
+import time
+import threading
+import numpy as np
+from scipy.sparse import csc_matrix
+from vsm_ir import load_processed_documents, calculate_tf_idf, query_to_tfidf_vector, rank_documents
+
+PROCESSED_DIR = 'data_processed'
+K_TOP = 5
+IMPACT_BITS = 8
+
+def build_impact_index(tfidf_matrix, n_bits=IMPACT_BITS):
+    # Kolom dinormalisasi (panjang 1) agar skor dot-product setara cosine similarity
+    tfidf = tfidf_matrix.tocsc().astype(np.float64)
+    norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    weights = tfidf.multiply(1.0 / norms[np.newaxis, :]).tocsr()
+
+    levels = (1 << n_bits) - 1
+    max_weight = weights.data.max() if weights.nnz else 1.0
+    scale = max_weight / levels
+
+    segments = []
+    for term_idx in range(weights.shape[0]):
+        start, end = weights.indptr[term_idx], weights.indptr[term_idx + 1]
+        docs = weights.indices[start:end]
+        impacts = np.maximum(1, np.rint(weights.data[start:end] / scale)).astype(np.uint16)
+
+        order = np.argsort(-impacts, kind='stable')
+        docs, impacts = docs[order], impacts[order]
+        boundaries = np.flatnonzero(np.diff(impacts)) + 1
+
+        term_segments = []
+        for seg_docs, seg_impacts in zip(np.split(docs, boundaries), np.split(impacts, boundaries)):
+            if seg_docs.size:
+                term_segments.append((int(seg_impacts[0]), seg_docs.astype(np.int32)))
+        segments.append(term_segments)
+
+    return {
+        'segments': segments,
+        'scale': scale,
+        'n_docs': weights.shape[1],
+        'scratch': threading.local(),
+    }
+
+CHECK_EVERY = 4096
+
+def _scratch(impact_index):
+    # Buffer akumulator per thread, dialokasikan sekali per index lalu dipakai ulang antar query;
+    # setelah query hanya dokumen yang tersentuh yang di-reset
+    local = impact_index['scratch']
+    if getattr(local, 'accumulators', None) is None:
+        local.accumulators = np.zeros(impact_index['n_docs'])
+        local.seen = np.zeros(impact_index['n_docs'], dtype=bool)
+    return local.accumulators, local.seen
+
+def _top_k(scores, k):
+    # Indeks k skor terbesar (menurun; skor sama menurut urutan posisi)
+    if scores.size > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.size)
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+def _topk_set_is_safe(scores, k, remaining):
+    # Himpunan top-k aman jika skor ke-k tidak bisa dilampaui dokumen lain, yang paling banyak
+    # bertambah sebesar sisa impact (dokumen yang belum tersentuh bernilai 0)
+    if remaining <= 0:
+        return True
+    if scores.size < k:
+        return False
+    if scores.size == k:
+        next_best = 0.0
+    else:
+        top = np.partition(scores, scores.size - k - 1)[scores.size - k - 1:]
+        next_best = top[0]
+        scores = top[1:]
+    return scores.min() >= next_best + remaining
+
+def score_at_a_time(query_vector, impact_index, doc_ids, k=K_TOP, max_postings=None, check_every=CHECK_EVERY):
+    # check_every=None mematikan early termination (evaluasi penuh atas impact terkuantisasi).
+    # Saat berhenti lebih awal, himpunan top-k sudah pasti; urutannya memakai skor parsial.
+    if k <= 0:
+        return [], 0
+    query = query_vector.tocsc()
+    term_weights = dict(zip(query.indices, query.data))
+    segments = impact_index['segments']
+
+    # Setiap segmen (term, impact) menyumbang impact * bobot query ke semua dokumennya
+    plan = []
+    for term_idx, q_weight in term_weights.items():
+        if q_weight <= 0:
+            continue
+        for impact, seg_docs in segments[term_idx]:
+            plan.append((impact * q_weight, term_idx, seg_docs))
+    plan.sort(key=lambda x: x[0], reverse=True)
+
+    # Sisa kontribusi maksimum per term = kontribusi segmen berikutnya yang belum diproses
+    next_same_term = [0.0] * len(plan)
+    upcoming = {}
+    for i in range(len(plan) - 1, -1, -1):
+        contrib, term_idx, _ = plan[i]
+        next_same_term[i] = upcoming.get(term_idx, 0.0)
+        upcoming[term_idx] = contrib
+    remaining = sum(upcoming.values())
+
+    accumulators, seen = _scratch(impact_index)
+    touched = []
+    processed = 0
+    next_check = check_every
+    try:
+        for i, (contrib, term_idx, seg_docs) in enumerate(plan):
+            if max_postings is not None and processed + seg_docs.size > max_postings:
+                # Anytime: sisa anggaran dipakai untuk awal segmen ini, lalu berhenti
+                seg_docs = seg_docs[:max_postings - processed]
+                stop = True
+            else:
+                stop = False
+
+            new_docs = seg_docs[~seen[seg_docs]]
+            seen[new_docs] = True
+            touched.append(new_docs)
+            accumulators[seg_docs] += contrib
+            processed += seg_docs.size
+            if stop:
+                break
+            remaining += next_same_term[i] - contrib
+
+            if check_every is not None and processed >= next_check:
+                candidates = np.concatenate(touched)
+                touched = [candidates]
+                if _topk_set_is_safe(accumulators[candidates], k, remaining):
+                    break
+                next_check = processed + check_every
+
+        candidates = np.concatenate(touched) if touched else np.zeros(0, dtype=np.int32)
+        candidates.sort()
+        scores = accumulators[candidates]
+        top = _top_k(scores, k)
+        scale = impact_index['scale']
+        ranking = [(doc_ids[candidates[i]], scores[i] * scale) for i in top]
+    finally:
+        for docs in touched:
+            accumulators[docs] = 0.0
+            seen[docs] = False
+    return ranking, processed
+
+def benchmark(n_docs=200000, n_terms=20000, n_query_terms=3, k=K_TOP, seed=0):
+    # Korpus sintetis dengan frekuensi term Zipf: bandingkan score-at-a-time dengan rank_documents
+    rng = np.random.default_rng(seed)
+    nnz = n_docs * 10
+    term_probs = 1.0 / np.arange(1, n_terms + 1) ** 1.1
+    rows = rng.choice(n_terms, size=nnz, p=term_probs / term_probs.sum())
+    cols = rng.integers(0, n_docs, size=nnz)
+    tf = csc_matrix((np.ones(nnz), (rows, cols)), shape=(n_terms, n_docs))
+    tf.data = 1 + np.log10(tf.data)
+    df = np.diff(tf.tocsr().indptr)
+    idf_vector = np.log10(n_docs / np.maximum(df, 1))
+    tfidf_matrix = tf.multiply(idf_vector[:, np.newaxis]).tocsc()
+    doc_ids = [f'D{j+1}' for j in range(n_docs)]
+
+    impact_index = build_impact_index(tfidf_matrix)
+    # Term query diambil dari term yang sering muncul agar postings yang dibaca cukup panjang
+    query_terms = rng.choice(np.argsort(-df)[:10 * n_query_terms], size=n_query_terms, replace=False)
+    query_vector = csc_matrix((idf_vector[query_terms], (query_terms, np.zeros(n_query_terms, dtype=int))),
+                              shape=(n_terms, 1))
+
+    start = time.perf_counter()
+    exhaustive = rank_documents(query_vector, tfidf_matrix, doc_ids)[:k]
+    t_exhaustive = time.perf_counter() - start
+
+    full, full_postings = score_at_a_time(query_vector, impact_index, doc_ids, k=k, check_every=None)
+
+    start = time.perf_counter()
+    ranking, processed = score_at_a_time(query_vector, impact_index, doc_ids, k=k)
+    t_saat = time.perf_counter() - start
+
+    start = time.perf_counter()
+    budgeted, budget_postings = score_at_a_time(query_vector, impact_index, doc_ids, k=k, max_postings=1000)
+    t_budget = time.perf_counter() - start
+
+    print(f"Korpus sintetis: N={n_docs}, V={n_terms}, postings query={full_postings}")
+    print(f"  rank_documents (exhaustive): {t_exhaustive * 1000:8.1f} ms")
+    print(f"  score_at_a_time            : {t_saat * 1000:8.1f} ms ({processed}/{full_postings} postings)")
+    print(f"  score_at_a_time (1000 post): {t_budget * 1000:8.1f} ms ({budget_postings} postings)")
+    print(f"  Himpunan top-{k} sama dengan evaluasi penuh: {set(d for d, _ in ranking) == set(d for d, _ in full)}")
+    print(f"  Overlap dengan cosine exhaustive: {len(set(d for d, _ in ranking) & set(d for d, _ in exhaustive))}/{k}")
+    return t_exhaustive, t_saat
+
+if __name__ == "__main__":
+    if '--bench' in sys.argv[1:]:
+        benchmark()
+        exit()
+
+    docs, doc_map, vocabulary, raw_text_map = load_processed_documents(PROCESSED_DIR)
+
+    if not docs:
+        print("Pastikan folder 'data_processed' ada dan berisi file CLEAN_*.txt.")
+        exit()
+
+    tfidf_matrix_doc, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(docs, vocabulary)
+    impact_index = build_impact_index(tfidf_matrix_doc)
+
+    print("="*80)
+    print("IMPACT-ORDERED INDEX & SCORE-AT-A-TIME RETRIEVAL")
+    print("="*80)
+    print(f"Total postings: {tfidf_matrix_doc.nnz} | Bit impact: {IMPACT_BITS}")
+    print("-" * 80)
+
+    queries_to_test = ["manajemen proyek teknologi", "sistem terdistribusi", "algoritma enkripsi rsa"]
+
+    for query_str in queries_to_test:
+        query_vector = query_to_tfidf_vector(query_str, term_to_idx, idf_vector)
+        exhaustive = rank_documents(query_vector, tfidf_matrix_doc, doc_ids)[:K_TOP]
+
+        start = time.perf_counter()
+        ranking, processed = score_at_a_time(query_vector, impact_index, doc_ids, k=K_TOP)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"\nQUERY: '{query_str.upper()}'")
+        print(f"  Exhaustive (cosine): {[d for d, s in exhaustive]}")
+        print(f"  Score-at-a-time    : {[d for d, s in ranking]} ({processed} postings, {elapsed:.3f} ms)")
@@ -0,0 +1,199 @@
+import os
+import sys
+import numpy as np
+from preprocess import get_stop_words, find_documents
+from preprocess_cache import CACHE_FILENAME, hash_text, hash_stop_words, get_stemmer_version, output_key, load_cache
+from corpus_store import CORPUS_FILENAME, is_corpus_stale, list_clean_files
+
+DATA_DIR = 'data'
+PROCESSED_DIR = 'data_processed'
+TOP_TERMS = 10
+
+def postings_stats(inverted_index, top_n=TOP_TERMS):
+    lengths = np.array([len(p) for p in inverted_index.values()], dtype=np.int64)
+    if lengths.size == 0:
+        return {'n_terms': 0, 'total_postings': 0, 'histogram': {}, 'heaviest_terms': []}
+
+    # Histogram berbasis pangkat dua: 1, 2-3, 4-7, 8-15, ...
+    histogram = {}
+    for exponent in range(int(np.log2(lengths.max())) + 1):
+        low, high = 1 << exponent, (1 << (exponent + 1)) - 1
+        count = int(np.count_nonzero((lengths >= low) & (lengths <= high)))
+        histogram[f"{low}-{high}" if high > low else f"{low}"] = count
+
+    heaviest = sorted(inverted_index.items(), key=lambda x: (-len(x[1]), x[0]))[:top_n]
+    return {
+        'n_terms': int(lengths.size),
+        'total_postings': int(lengths.sum()),
+        'min': int(lengths.min()),
+        'max': int(lengths.max()),
+        'mean': float(lengths.mean()),
+        'median': float(np.median(lengths)),
+        'p90': float(np.percentile(lengths, 90)),
+        'histogram': histogram,
+        'heaviest_terms': [(term, len(postings)) for term, postings in heaviest],
+    }
+
+def _dict_index_bytes(inverted_index):
+    # Perkiraan ukuran "deep" dict: dict + key + list + objek doc_id unik
+    total = sys.getsizeof(inverted_index)
+    seen = set()
+    for term, postings in inverted_index.items():
+        total += sys.getsizeof(term) + sys.getsizeof(postings)
+        for doc_id in postings:
+            if id(doc_id) not in seen:
+                seen.add(id(doc_id))
+                total += sys.getsizeof(doc_id)
+    return total
+
+def _sparse_bytes(matrix):
+    return int(matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes)
+
+def memory_footprint(inverted_index=None, tfidf_matrix=None, incidence_matrix=None):
+    footprint = {}
+    if inverted_index is not None:
+        footprint['inverted_index (dict)'] = {'bytes': _dict_index_bytes(inverted_index)}
+    if tfidf_matrix is not None:
+        tfidf = tfidf_matrix if hasattr(tfidf_matrix, 'indptr') else tfidf_matrix.tocsc()
+        n_rows, n_cols = tfidf.shape
+        footprint[f'tfidf ({tfidf.format.upper()})'] = {
+            'bytes': _sparse_bytes(tfidf),
+            'nnz': int(tfidf.nnz),
+            'density': tfidf.nnz / ((n_rows * n_cols) or 1),
+            'dense_equivalent_bytes': n_rows * n_cols * tfidf.dtype.itemsize,
+        }
+    if incidence_matrix is not None:
+        footprint['incidence (dense)'] = {
+            'bytes': int(incidence_matrix.nbytes),
+            'nnz': int(np.count_nonzero(incidence_matrix)),
+            'density': np.count_nonzero(incidence_matrix) / (incidence_matrix.size or 1),
+        }
+    return footprint
+
+def estimate_query_cost(query_tokens, inverted_index, n_docs):
+    # Biaya dalam jumlah posting yang dibaca; VSM masih ditambah pengurutan N dokumen
+    terms = [t for t in query_tokens if t.upper() not in ('AND', 'OR', 'NOT')]
+    postings = {term: len(inverted_index.get(term, [])) for term in terms}
+    postings_read = sum(postings.values())
+    return {
+        'terms': postings,
+        'unknown_terms': [t for t, n in postings.items() if n == 0],
+        'boolean_postings': postings_read + (n_docs if 'NOT' in (t.upper() for t in query_tokens) else 0),
+        'vsm_postings': postings_read,
+        'vsm_sort_ops': int(n_docs * max(np.log2(n_docs), 1)) if n_docs else 0,
+    }
+
+def detect_stale_index(data_dir=None, processed_dir=None):
+    # Default: data/ dan data_processed/ di root proyek
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if data_dir is None:
+        data_dir = os.path.join(current_dir, '..', DATA_DIR)
+    if processed_dir is None:
+        processed_dir = os.path.join(current_dir, '..', PROCESSED_DIR)
+
+    cache = load_cache(os.path.join(processed_dir, CACHE_FILENAME), get_stemmer_version())
+    stop_words_hash = hash_stop_words(get_stop_words(os.path.join(data_dir, 'stopwords.txt')))
+    stemmer_version = get_stemmer_version()
+
+    issues = []
+    expected = set()
+    for path in sorted(find_documents(data_dir)):
+        doc_id = os.path.basename(path)
+        clean_filename = f"CLEAN_{os.path.splitext(doc_id)[0]}.txt"
+        clean_path = os.path.join(processed_dir, clean_filename)
+        expected.add(clean_filename)
+
+        if not os.path.exists(clean_path):
+            issues.append(('missing', clean_filename))
+            continue
+
+        cached = cache['outputs'].get(doc_id)
+        if cached is not None:
+            with open(path, 'r', encoding='utf-8') as f:
+                key = output_key(hash_text(f.read()), stop_words_hash, stemmer_version)
+            if cached.get('key') != key:
+                issues.append(('stale', clean_filename))
+        elif os.path.getmtime(path) > os.path.getmtime(clean_path):
+            issues.append(('stale', clean_filename))
+
+    for filename in list_clean_files(processed_dir):
+        if filename not in expected:
+            issues.append(('orphan', filename))
+
+    if os.path.exists(os.path.join(processed_dir, CORPUS_FILENAME)) and is_corpus_stale(processed_dir):
+        issues.append(('stale', CORPUS_FILENAME))
+    return issues
+
+def build_index_report(inverted_index, tfidf_matrix=None, incidence_matrix=None, n_docs=0, query_tokens=None, top_n=TOP_TERMS,
+                       data_dir=None, processed_dir=None):
+    report = {
+        'n_docs': n_docs,
+        'postings': postings_stats(inverted_index, top_n),
+        'memory': memory_footprint(inverted_index, tfidf_matrix, incidence_matrix),
+        'stale': detect_stale_index(data_dir, processed_dir),
+    }
+    if query_tokens:
+        report['query_cost'] = estimate_query_cost(query_tokens, inverted_index, n_docs)
+    return report
+
+def print_index_report(report):
+    postings = report['postings']
+    print("=" * 80)
+    print("INDEX STATISTICS & HEALTH REPORT")
+    print("=" * 80)
+    print(f"Dokumen: {report['n_docs']} | Term: {postings['n_terms']} | Total postings: {postings['total_postings']}")
+    if postings['n_terms']:
+        print(f"Panjang postings: min={postings['min']} max={postings['max']} mean={postings['mean']:.2f} "
+              f"median={postings['median']:.1f} p90={postings['p90']:.1f}")
+        print("\nDistribusi panjang postings:")
+        for bucket, count in postings['histogram'].items():
+            print(f"  {bucket:>12}: {count}")
+        print("\nTerm terberat:")
+        for term, length in postings['heaviest_terms']:
+            print(f"  {term:<25}{length}")
+
+    print("\nMemori per struktur:")
+    for name, info in report['memory'].items():
+        line = f"  {name:<25}{info['bytes'] / 1024:>10.1f} KiB"
+        if 'density' in info:
+            line += f" | nnz={info['nnz']} density={info['density']:.4%}"
+        if 'dense_equivalent_bytes' in info:
+            line += f" | dense={info['dense_equivalent_bytes'] / 1024:.1f} KiB"
+        print(line)
+
+    if 'query_cost' in report:
+        cost = report['query_cost']
+        print("\nEstimasi biaya query:")
+        for term, length in cost['terms'].items():
+            print(f"  {term:<25}{length} postings")
+        print(f"  Boolean: {cost['boolean_postings']} postings | VSM: {cost['vsm_postings']} postings "
+              f"+ ~{cost['vsm_sort_ops']} operasi sort")
+        if cost['unknown_terms']:
+            print(f"  Term tidak ada di index: {cost['unknown_terms']}")
+
+    print("\nStatus index terhadap data/:")
+    if not report['stale']:
+        print("  OK - index sesuai dengan dokumen di data/.")
+    for status, filename in report['stale']:
+        print(f"  [{status.upper()}] {filename}")
+    print("=" * 80)
+
+if __name__ == "__main__":
+    from boolean_ir import load_processed_documents, build_inverted_index, build_incidence_matrix
+    from vsm_ir import calculate_tf_idf
+    from query_analyzer import get_query_analyzer
+
+    docs, doc_map, vocabulary = load_processed_documents(PROCESSED_DIR)
+    if not docs:
+        print("Folder 'data_processed' kosong. Jalankan preprocess.py dulu!")
+        exit()
+
+    inverted_index = build_inverted_index(docs)
+    incidence_matrix, _ = build_incidence_matrix(docs, vocabulary)
+    tfidf_matrix, _, _, _ = calculate_tf_idf(docs, vocabulary)
+
+    query_str = " ".join(sys.argv[1:])
+    query_tokens = get_query_analyzer().analyze(query_str) if query_str else None
+    report = build_index_report(inverted_index, tfidf_matrix, incidence_matrix, len(docs), query_tokens,
+                                data_dir=DATA_DIR, processed_dir=PROCESSED_DIR)
+    print_index_report(report)
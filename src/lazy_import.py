@@ -0,0 +1,54 @@
+import sys
+import time
+import importlib
+from contextlib import contextmanager
+
+PROCESS_START = time.perf_counter()
+HEAVY_MODULES = ('numpy', 'scipy', 'sklearn', 'Sastrawi')
+IMPORT_PROFILE = []
+
+@contextmanager
+def profile_import(name):
+    before = set(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        loaded = {m.split('.')[0] for m in set(sys.modules) - before}
+        IMPORT_PROFILE.append((name, elapsed, [h for h in HEAVY_MODULES if h in loaded]))
+
+def import_module(name):
+    module = sys.modules.get(name)
+    if module is None:
+        with profile_import(name):
+            module = importlib.import_module(name)
+    return module
+
+class LazyFunction:
+    """Fungsi dari modul lain yang baru di-import saat pertama kali dipanggil."""
+
+    def __init__(self, module_name, attr_name):
+        self.module_name = module_name
+        self.attr_name = attr_name
+
+    def __call__(self, *args, **kwargs):
+        return getattr(import_module(self.module_name), self.attr_name)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self.module_name}.{self.attr_name}>"
+
+def lazy_function(module_name, attr_name):
+    return LazyFunction(module_name, attr_name)
+
+def print_startup_report(first_prompt_time=None, start_time=PROCESS_START):
+    print("\n=== STARTUP PROFILE ===")
+    if first_prompt_time is not None:
+        print(f"Time-to-first-prompt: {(first_prompt_time - start_time) * 1000:.1f} ms (di luar startup interpreter)")
+    if not IMPORT_PROFILE:
+        print("Tidak ada modul yang di-import secara lazy.")
+        return
+    print(f"{'Modul':<20}{'Waktu (ms)':>12}  Dependensi berat yang ikut dimuat")
+    print("-" * 70)
+    for name, elapsed, heavy in IMPORT_PROFILE:
+        print(f"{name:<20}{elapsed * 1000:>12.1f}  {', '.join(heavy) or '-'}")
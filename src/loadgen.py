@@ -0,0 +1,234 @@
+import sys
+import time
+import random
+import argparse
+import itertools
+import threading
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+
+PROCESSED_DIR = 'data_processed'
+K_TOP = 5
+HISTOGRAM_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+def load_query_log(path):
+    # Satu query per baris; baris kosong dan komentar '#' dilewati
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+def zipf_queries(inverted_index, n_queries, s=1.1, max_terms=3, boolean_ops=False, seed=42, exclude=()):
+    # Term diurutkan menurut document frequency; peluang term ke-r sebanding dengan 1 / r^s.
+    # Term di `exclude` (mis. stopword) dilewati karena akan dibuang oleh analyzer query.
+    terms = sorted((t for t in inverted_index if t not in exclude), key=lambda t: (-len(inverted_index[t]), t))
+    if not terms:
+        return []
+    weights = 1.0 / np.arange(1, len(terms) + 1) ** s
+    rng = random.Random(seed)
+
+    queries = []
+    for _ in range(n_queries):
+        if boolean_ops:
+            shape = rng.choice(('TERM', 'AND', 'OR', 'NOT'))
+            picked = rng.choices(terms, weights=weights, k=2)
+            if shape == 'TERM':
+                queries.append(picked[0])
+            elif shape == 'NOT':
+                queries.append(f"NOT {picked[0]}")
+            else:
+                queries.append(f"{picked[0]} {shape} {picked[1]}")
+        else:
+            queries.append(" ".join(rng.choices(terms, weights=weights, k=rng.randint(1, max_terms))))
+    return queries
+
+def build_engines(processed_dir=PROCESSED_DIR, n_threads=1):
+    from boolean_ir import build_inverted_index, boolean_retrieve
+    from vsm_ir import load_processed_documents, calculate_tf_idf, rank_top_k
+    from query_analyzer import get_query_analyzer, plan_to_tfidf_vector
+
+    docs, doc_map, vocabulary, raw_text_map = load_processed_documents(processed_dir)
+    inverted_index = build_inverted_index(docs)
+    all_doc_ids = sorted(docs.keys())
+    tfidf_matrix, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(docs, vocabulary)
+    analyzer = get_query_analyzer()
+
+    def boolean_engine(query):
+        return boolean_retrieve(query, inverted_index, all_doc_ids, None, None, analyzer=analyzer)
+
+    def vsm_engine(query):
+        plan = analyzer.compile(query, term_to_idx, idf_vector)
+        return rank_top_k(plan_to_tfidf_vector(plan, len(term_to_idx)), tfidf_matrix, doc_ids, K_TOP, n_threads)
+
+    return {'boolean': boolean_engine, 'vsm': vsm_engine}, inverted_index
+
+def http_engine(url, timeout=10.0):
+    # Server lokal diasumsikan menerima query lewat parameter ?q=...
+    def engine(query):
+        with urllib.request.urlopen(f"{url}?{urllib.parse.urlencode({'q': query})}", timeout=timeout) as response:
+            return response.read()
+    return engine
+
+def _timed_call(engine, query, start):
+    try:
+        engine(query)
+        ok = True
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run_closed_loop(engine, queries, concurrency=1, duration=10.0, n_requests=None):
+    # Setiap worker langsung mengirim query berikutnya setelah respons sebelumnya diterima;
+    # jika n_requests diisi, run berhenti setelah n_requests query (duration diabaikan)
+    counter = itertools.count()
+    results = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration if n_requests is None else float('inf')
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            i = next(counter)
+            if n_requests is not None and i >= n_requests:
+                break
+            local.append(_timed_call(engine, queries[i % len(queries)], time.perf_counter()))
+        with lock:
+            results.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+def run_open_loop(engine, queries, qps, concurrency=8, duration=10.0, n_requests=None):
+    # Query dikirim sesuai jadwal tanpa menunggu respons; latensi dihitung dari waktu terjadwal
+    # sehingga antrean saat server kewalahan ikut terukur (tanpa coordinated omission)
+    total = n_requests if n_requests is not None else int(qps * duration)
+    interval = 1.0 / qps
+    futures = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(_timed_call, engine, queries[i % len(queries)], scheduled))
+        wait(futures)
+    return [f.result() for f in futures], time.perf_counter() - start
+
+def summarize(results, elapsed):
+    latencies_ms = np.array([lat * 1000 for lat, ok in results if ok])
+    errors = sum(1 for _, ok in results if not ok)
+    report = {
+        'requests': len(results),
+        'errors': errors,
+        'elapsed_s': elapsed,
+        'throughput_qps': len(latencies_ms) / elapsed if elapsed > 0 else 0.0,
+        'histogram': {},
+    }
+    if latencies_ms.size == 0:
+        return report
+
+    for name, q in (('p50', 50), ('p90', 90), ('p95', 95), ('p99', 99), ('p999', 99.9)):
+        report[name] = float(np.percentile(latencies_ms, q))
+    report['mean'] = float(latencies_ms.mean())
+    report['max'] = float(latencies_ms.max())
+
+    edges = (0.0,) + HISTOGRAM_BUCKETS_MS + (float('inf'),)
+    counts, _ = np.histogram(latencies_ms, bins=edges)
+    for low, high, count in zip(edges[:-1], edges[1:], counts):
+        label = f"<= {high:g} ms" if high != float('inf') else f"> {low:g} ms"
+        report['histogram'][label] = int(count)
+    return report
+
+def print_load_report(report, title="LOAD TEST REPORT"):
+    print("=" * 70)
+    print(title)
+    print("=" * 70)
+    print(f"Request: {report['requests']} | Error: {report['errors']} | Durasi: {report['elapsed_s']:.2f} s")
+    print(f"Throughput: {report['throughput_qps']:.1f} query/detik")
+    if 'p50' not in report:
+        print("Tidak ada request yang berhasil.")
+        return
+    print(f"Latensi (ms): mean={report['mean']:.3f} p50={report['p50']:.3f} p90={report['p90']:.3f} "
+          f"p95={report['p95']:.3f} p99={report['p99']:.3f} p99.9={report['p999']:.3f} max={report['max']:.3f}")
+
+    print("\nHistogram latensi:")
+    peak = max(report['histogram'].values()) or 1
+    for label, count in report['histogram'].items():
+        if count:
+            print(f"  {label:>12} {count:>8}  {'#' * max(1, int(40 * count / peak))}")
+    print("=" * 70)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay query log / query Zipf untuk uji beban mesin pencari.")
+    parser.add_argument('--engine', choices=('boolean', 'vsm', 'http'), default='vsm')
+    parser.add_argument('--url', help="URL server lokal untuk --engine http (query dikirim sebagai ?q=)")
+    parser.add_argument('--query-log', help="File query, satu query per baris (default: sampel Zipf)")
+    parser.add_argument('--zipf-queries', type=int, default=1000)
+    parser.add_argument('--zipf-s', type=float, default=1.1)
+    parser.add_argument('--max-terms', type=int, default=3)
+    parser.add_argument('--mode', choices=('open', 'closed'), default='closed')
+    parser.add_argument('--qps', type=float, default=100.0, help="Target QPS untuk mode open-loop")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=1, help="Thread skoring per query VSM (1 = serial)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Durasi run dalam detik (diabaikan jika --requests diisi)")
+    parser.add_argument('--requests', type=int, default=None, help="Jumlah request total (menggantikan --duration)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--slo-p99-ms', type=float, default=None, help="Gagal (exit code 1) jika p99 melebihi nilai ini")
+    parser.add_argument('--processed-dir', default=PROCESSED_DIR)
+    args = parser.parse_args(argv)
+
+    if args.engine == 'http' and not args.url:
+        parser.error("--engine http membutuhkan --url")
+    if args.qps <= 0:
+        parser.error("--qps harus lebih besar dari 0")
+    if args.concurrency < 1:
+        parser.error("--concurrency minimal 1")
+    if args.requests is not None and args.requests < 1:
+        parser.error("--requests minimal 1")
+
+    inverted_index = None
+    if args.engine == 'http':
+        engine = http_engine(args.url)
+    else:
+        engines, inverted_index = build_engines(args.processed_dir, args.threads)
+        engine = engines[args.engine]
+
+    if args.query_log:
+        queries = load_query_log(args.query_log)
+    else:
+        if inverted_index is None:
+            _, inverted_index = build_engines(args.processed_dir)
+        from query_analyzer import get_query_analyzer
+        queries = zipf_queries(inverted_index, args.zipf_queries, args.zipf_s, args.max_terms,
+                               boolean_ops=args.engine == 'boolean', seed=args.seed,
+                               exclude=get_query_analyzer().stop_words)
+    if not queries:
+        print("Tidak ada query untuk dijalankan.")
+        return 1
+
+    print(f"Engine: {args.engine} | Mode: {args.mode} | Concurrency: {args.concurrency} | "
+          f"Thread skoring: {args.threads} | Query unik: {len(set(queries))}")
+    if args.mode == 'open':
+        results, elapsed = run_open_loop(engine, queries, args.qps, args.concurrency, args.duration, args.requests)
+    else:
+        results, elapsed = run_closed_loop(engine, queries, args.concurrency, args.duration, args.requests)
+
+    report = summarize(results, elapsed)
+    print_load_report(report)
+
+    if args.slo_p99_ms is not None:
+        if report.get('p99', float('inf')) > args.slo_p99_ms or report['errors']:
+            print(f"SLO GAGAL: p99 melebihi {args.slo_p99_ms} ms atau ada error.")
+            return 1
+        print(f"SLO OK: p99 <= {args.slo_p99_ms} ms.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
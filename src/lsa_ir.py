@@ -0,0 +1,116 @@
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from vsm_ir import load_processed_documents, calculate_tf_idf, query_to_tfidf_vector, rank_documents
+
+PROCESSED_DIR = 'data_processed'
+K_TOP = 5
+N_COMPONENTS = 100
+N_PROBE = 1
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+def build_lsa_embeddings(tfidf_matrix, n_components=N_COMPONENTS, random_state=42):
+    # tfidf_matrix berukuran V x N, SVD dihitung pada bentuk dokumen x term
+    doc_term = tfidf_matrix.transpose().tocsr()
+    n_docs, n_terms = doc_term.shape
+    n_components = max(1, min(n_components, n_docs - 1, n_terms - 1))
+
+    svd = TruncatedSVD(n_components=n_components, random_state=random_state)
+    doc_embeddings = _normalize_rows(svd.fit_transform(doc_term))
+    return doc_embeddings, svd
+
+def query_to_lsa_vector(query_vector, svd):
+    query_embedding = svd.transform(query_vector.transpose())
+    return _normalize_rows(query_embedding)[0]
+
+def _kmeans(embeddings, n_lists, n_iter, random_state):
+    rng = np.random.default_rng(random_state)
+    init_idx = rng.choice(embeddings.shape[0], size=n_lists, replace=False)
+    centroids = embeddings[init_idx].copy()
+
+    for _ in range(n_iter):
+        assignments = np.argmax(embeddings @ centroids.T, axis=1)
+        for c in range(n_lists):
+            members = embeddings[assignments == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _normalize_rows(centroids)
+
+    assignments = np.argmax(embeddings @ centroids.T, axis=1)
+    return centroids, assignments
+
+def build_ivf_index(doc_embeddings, n_lists=None, n_iter=10, random_state=42):
+    n_docs = doc_embeddings.shape[0]
+    if n_lists is None:
+        n_lists = int(np.sqrt(n_docs)) or 1
+    n_lists = max(1, min(n_lists, n_docs))
+
+    centroids, assignments = _kmeans(doc_embeddings, n_lists, n_iter, random_state)
+    inverted_lists = [np.flatnonzero(assignments == c) for c in range(n_lists)]
+
+    return {
+        'centroids': centroids,
+        'lists': inverted_lists,
+        'embeddings': doc_embeddings,
+    }
+
+def ivf_search(query_embedding, ivf_index, doc_ids, k=K_TOP, n_probe=N_PROBE):
+    # n_probe adalah kenop recall/latensi: makin banyak list diperiksa, makin tinggi recall
+    centroids = ivf_index['centroids']
+    n_probe = max(1, min(n_probe, len(centroids)))
+
+    centroid_scores = centroids @ query_embedding
+    probe_lists = np.argsort(-centroid_scores)[:n_probe]
+    candidates = np.concatenate([ivf_index['lists'][c] for c in probe_lists])
+    if candidates.size == 0:
+        return []
+
+    scores = ivf_index['embeddings'][candidates] @ query_embedding
+    top = np.argsort(-scores)[:k]
+    return [(doc_ids[candidates[i]], float(scores[i])) for i in top]
+
+def fuse_rankings(sparse_ranking, dense_ranking, k=K_TOP, rrf_k=60):
+    # Reciprocal Rank Fusion antara ranking TF-IDF (sparse) dan LSA (dense);
+    # dokumen dengan skor <= 0 tidak cocok dengan query sehingga tidak ikut difusi
+    fused = {}
+    for ranking in (sparse_ranking, dense_ranking):
+        ranking = [(doc_id, score) for doc_id, score in ranking if score > 0]
+        for rank, (doc_id, score) in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)[:k]
+
+if __name__ == "__main__":
+
+    docs, doc_map, vocabulary, raw_text_map = load_processed_documents(PROCESSED_DIR)
+
+    if not docs:
+        print("Pastikan folder 'data_processed' ada dan berisi file CLEAN_*.txt.")
+        exit()
+
+    tfidf_matrix_doc, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(docs, vocabulary)
+    doc_embeddings, svd = build_lsa_embeddings(tfidf_matrix_doc)
+    ivf_index = build_ivf_index(doc_embeddings)
+
+    print("="*80)
+    print("LATENT SEMANTIC ANALYSIS (LSA) + IVF ANN RETRIEVAL")
+    print("="*80)
+    print(f"Dimensi embedding: {doc_embeddings.shape} ({doc_embeddings.dtype})")
+    print(f"Jumlah inverted list (IVF): {len(ivf_index['centroids'])}")
+    print("-" * 80)
+
+    queries_to_test = ["manajemen proyek teknologi", "sistem terdistribusi", "algoritma enkripsi rsa"]
+
+    for query_str in queries_to_test:
+        query_vector = query_to_tfidf_vector(query_str, term_to_idx, idf_vector)
+        sparse_ranking = rank_documents(query_vector, tfidf_matrix_doc, doc_ids)
+        query_embedding = query_to_lsa_vector(query_vector, svd)
+        dense_ranking = ivf_search(query_embedding, ivf_index, doc_ids, k=K_TOP, n_probe=len(ivf_index['centroids']))
+
+        print(f"\nQUERY: '{query_str.upper()}'")
+        print(f"  Sparse (TF-IDF): {[d for d, s in sparse_ranking[:K_TOP]]}")
+        print(f"  Dense  (LSA)   : {[d for d, s in dense_ranking]}")
+        print(f"  Fusion (RRF)   : {[d for d, s in fuse_rankings(sparse_ranking[:K_TOP], dense_ranking)]}")
@@ -3,16 +3,22 @@ import re
 import glob
 from collections import Counter
 from typing import List, Set, Any, Dict, Tuple
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+from preprocess_cache import (
+    CACHE_FILENAME, hash_text, hash_stop_words, get_stemmer_version, output_key,
+    new_cache, load_cache, save_cache, get_cached_tokens, touch_cached_tokens, prune_cache, stem_with_cache,
+)
+from corpus_store import CORPUS_FILENAME, convert_clean_files, is_corpus_stale
 
 def get_stemmer():
+    # Import Sastrawi ditunda sampai stemmer benar-benar dibutuhkan
+    from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
     factory = StemmerFactory()
     return factory.create_stemmer()
 
-def get_stop_words() -> Set[str]:
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    filepath = os.path.join(current_dir, '..', 'data', 'stopwords.txt')
+def get_stop_words(filepath: str = None) -> Set[str]:
+    if filepath is None:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        filepath = os.path.join(current_dir, '..', 'data', 'stopwords.txt')
 
     stop_words = set()
     try:
@@ -25,15 +31,16 @@ def get_stop_words() -> Set[str]:
         print(f"[PERINGATAN] stopwords.txt tidak ditemukan di {filepath}. Menggunakan set kosong.")
     return stop_words
 
+def find_documents(data_dir: str) -> List[str]:
+    return [
+        p for p in glob.glob(os.path.join(data_dir, '*.txt'))
+        if not os.path.basename(p).lower() == 'stopwords.txt'
+    ]
+
 def list_all_documents() -> List[str]:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_dir = os.path.join(current_dir, '..', 'data')
-    document_paths = glob.glob(os.path.join(data_dir, '*.txt'))
-
-    document_paths = [
-        p for p in document_paths
-        if not os.path.basename(p).lower() == 'stopwords.txt'
-    ]
+    document_paths = find_documents(data_dir)
     
     if not document_paths:
         print(f"[PERINGATAN] Tidak ada dokumen ditemukan di {data_dir}")
@@ -88,9 +95,17 @@ def initialize_preprocessing() -> Tuple[Any, Set[str]]:
     stop_words = get_stop_words()
     return stemmer, stop_words
 
-def get_processed_corpus() -> Dict[str, List[str]]:
-    stemmer, stop_words = initialize_preprocessing()
-    
+def get_processed_corpus(use_cache: bool = True) -> Dict[str, List[str]]:
+    stop_words = get_stop_words()
+    stemmer = None
+
+    def get_cached_stemmer():
+        # Stemmer Sastrawi mahal dibuat, jadi hanya dibuat jika ada kata yang belum di-cache
+        nonlocal stemmer
+        if stemmer is None:
+            stemmer = get_stemmer()
+        return stemmer
+
     doc_paths = list_all_documents()
     
     raw_documents = load_all_documents(doc_paths)
@@ -99,22 +114,72 @@ def get_processed_corpus() -> Dict[str, List[str]]:
     processed_dir = os.path.join(current_dir, '..', 'data_processed')
     os.makedirs(processed_dir, exist_ok=True)
 
+    cache_path = os.path.join(processed_dir, CACHE_FILENAME)
+    stemmer_version = get_stemmer_version()
+    stop_words_hash = hash_stop_words(stop_words)
+    cache = load_cache(cache_path, stemmer_version) if use_cache else new_cache(stemmer_version)
+
     processed_corpus = {}
+    live_documents = {}
+    skipped = 0
+    written = 0
     print(f"Memproses {len(raw_documents)} dokumen...")
 
     for doc_id, text in raw_documents.items():
-        processed_tokens = preprocess_document(text, stemmer, stop_words)
-        processed_corpus[doc_id] = processed_tokens
-
         clean_filename = f"CLEAN_{os.path.splitext(doc_id)[0]}.txt"
         clean_path = os.path.join(processed_dir, clean_filename)
+
+        raw_hash = hash_text(text)
+        live_documents[doc_id] = raw_hash
+        key = output_key(raw_hash, stop_words_hash, stemmer_version)
+        previous = cache['outputs'].get(doc_id, {})
+
+        if previous.get('key') == key and os.path.exists(clean_path):
+            try:
+                with open(clean_path, 'r', encoding='utf-8') as f:
+                    processed_corpus[doc_id] = f.read().split()
+                touch_cached_tokens(cache, raw_hash)
+                previous['raw_hash'] = raw_hash
+                skipped += 1
+                continue
+            except Exception:
+                pass
+
+        tokens = get_cached_tokens(cache, raw_hash, text, tokenize_text)
+        tokens = remove_stop_words(tokens, stop_words)
+        processed_tokens = stem_with_cache(tokens, cache, get_cached_stemmer)
+        processed_corpus[doc_id] = processed_tokens
+
+        content = ' '.join(processed_tokens)
+        content_hash = hash_text(content)
+        if previous.get('content_hash') == content_hash and os.path.exists(clean_path):
+            cache['outputs'][doc_id] = {'key': key, 'raw_hash': raw_hash, 'content_hash': content_hash}
+            skipped += 1
+            continue
+
         try:
             with open(clean_path, 'w', encoding='utf-8') as f:
-                f.write(' '.join(processed_tokens))
+                f.write(content)
+            cache['outputs'][doc_id] = {'key': key, 'raw_hash': raw_hash, 'content_hash': content_hash}
+            written += 1
             print(f"[OK] {clean_filename} disimpan ({len(processed_tokens)} token).")
         except Exception as e:
             print(f"[ERROR] Gagal menyimpan {clean_filename}: {e}")
-    
+
+    if use_cache:
+        prune_cache(cache, live_documents)
+        save_cache(cache, cache_path)
+
+    if written or is_corpus_stale(processed_dir):
+        # Dibangun dari semua file CLEAN_*.txt (termasuk yang tidak lagi ada di data/), sama seperti
+        # load_processed_documents, agar doc_id D1..DN di korpus biner dan di CLEAN_*.txt selalu cocok
+        try:
+            convert_clean_files(processed_dir)
+            print(f"[OK] Korpus biner {CORPUS_FILENAME} diperbarui.")
+        except Exception as e:
+            print(f"[ERROR] Gagal menyimpan {CORPUS_FILENAME}: {e}")
+    if skipped:
+        print(f"[CACHE] {skipped} dokumen tidak berubah, dilewati.")
     print(f"\nSemua dokumen tersimpan di folder: {processed_dir}")
     return processed_corpus
 
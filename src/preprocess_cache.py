@@ -0,0 +1,123 @@
+import os
+import json
+import time
+import hashlib
+from typing import List, Set, Any, Dict, Callable
+
+CACHE_FILENAME = '.preprocess_cache.json'
+STEMS_FILENAME = '.stem_cache.json'
+MAX_CACHED_TOKENS = 5_000_000
+MAX_CACHED_STEMS = 200_000
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def hash_stop_words(stop_words: Set[str]) -> str:
+    return hash_text('\n'.join(sorted(stop_words)))
+
+def get_stemmer_version() -> str:
+    try:
+        from importlib.metadata import version
+        return f"sastrawi-{version('Sastrawi')}"
+    except Exception:
+        return 'sastrawi-unknown'
+
+def output_key(raw_hash: str, stop_words_hash: str, stemmer_version: str) -> str:
+    return hash_text(f"{raw_hash}:{stop_words_hash}:{stemmer_version}")
+
+def new_cache(stemmer_version: str) -> Dict[str, Any]:
+    return {'stemmer_version': stemmer_version, 'documents': {}, 'stems': {}, 'outputs': {}}
+
+def stems_path(cache_path: str) -> str:
+    return os.path.join(os.path.dirname(cache_path), STEMS_FILENAME)
+
+def load_stem_table(path: str, stemmer_version: str) -> Dict[str, str]:
+    # Tabel stem disimpan terpisah agar analyzer query tidak perlu membaca seluruh cache token
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if table.get('stemmer_version') != stemmer_version:
+        return {}
+    return table.get('stems', {})
+
+def load_cache(path: str, stemmer_version: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):
+        cache = new_cache(stemmer_version)
+
+    if cache.get('stemmer_version') != stemmer_version:
+        # Token hasil tokenisasi tidak bergantung pada stemmer, sehingga tetap dipakai
+        fresh = new_cache(stemmer_version)
+        fresh['documents'] = cache.get('documents', {})
+        return fresh
+    for section in ('documents', 'outputs'):
+        cache.setdefault(section, {})
+    # Cache lama masih menyimpan stem di file utama
+    cache['stems'] = load_stem_table(stems_path(path), stemmer_version) or cache.get('stems', {})
+    return cache
+
+def evict_cache(cache: Dict[str, Any], max_tokens: int = MAX_CACHED_TOKENS, max_stems: int = MAX_CACHED_STEMS):
+    documents = cache['documents']
+    total_tokens = sum(len(entry['tokens']) for entry in documents.values())
+    if total_tokens > max_tokens:
+        for raw_hash, entry in sorted(documents.items(), key=lambda kv: kv[1]['last_used']):
+            if total_tokens <= max_tokens:
+                break
+            total_tokens -= len(entry['tokens'])
+            del documents[raw_hash]
+
+    # Urutan dict = urutan terakhir dipakai, entri paling awal adalah yang paling lama
+    stems = cache['stems']
+    if len(stems) > max_stems:
+        cache['stems'] = dict(list(stems.items())[-max_stems:])
+
+def save_cache(cache: Dict[str, Any], path: str, max_tokens: int = MAX_CACHED_TOKENS, max_stems: int = MAX_CACHED_STEMS):
+    evict_cache(cache, max_tokens, max_stems)
+    try:
+        _write_json({key: value for key, value in cache.items() if key != 'stems'}, path)
+        _write_json({'stemmer_version': cache['stemmer_version'], 'stems': cache['stems']}, stems_path(path))
+    except Exception as e:
+        print(f"[PERINGATAN] Gagal menyimpan cache preprocessing: {e}")
+
+def _write_json(obj: Any, path: str):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def get_cached_tokens(cache: Dict[str, Any], raw_hash: str, text: str, tokenize: Callable[[str], List[str]]) -> List[str]:
+    documents = cache['documents']
+    entry = documents.get(raw_hash)
+    if entry is None:
+        entry = {'tokens': tokenize(text)}
+        documents[raw_hash] = entry
+    entry['last_used'] = time.time()
+    return entry['tokens']
+
+def touch_cached_tokens(cache: Dict[str, Any], raw_hash: str):
+    # Dokumen yang dilewati tetap dihitung "dipakai" agar tidak tergusur eviksi LRU
+    entry = cache['documents'].get(raw_hash)
+    if entry is not None:
+        entry['last_used'] = time.time()
+
+def prune_cache(cache: Dict[str, Any], live_documents: Dict[str, str]):
+    # live_documents: doc_id -> raw_hash dokumen yang saat ini ada di data/; entri dokumen yang
+    # sudah dihapus dan token versi lama dokumen yang diedit dibuang
+    live_hashes = set(live_documents.values())
+    cache['outputs'] = {doc_id: entry for doc_id, entry in cache['outputs'].items() if doc_id in live_documents}
+    cache['documents'] = {h: entry for h, entry in cache['documents'].items() if h in live_hashes}
+
+def stem_with_cache(tokens: List[str], cache: Dict[str, Any], get_stemmer: Callable[[], Any]) -> List[str]:
+    stems = cache['stems']
+    lookup = {}
+    for token in set(tokens):
+        stem = stems.pop(token, None)
+        if stem is None:
+            stem = get_stemmer().stem(token)
+        stems[token] = stem
+        lookup[token] = stem
+    return [lookup[t] for t in tokens]
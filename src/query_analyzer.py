@@ -0,0 +1,128 @@
+import os
+import threading
+from collections import Counter, OrderedDict, namedtuple
+import numpy as np
+from scipy.sparse import csr_matrix
+from preprocess import get_stemmer, get_stop_words, tokenize_text
+from preprocess_cache import STEMS_FILENAME, MAX_CACHED_STEMS, get_stemmer_version, load_stem_table
+
+MAX_CACHED_QUERIES = 1024
+BOOLEAN_OPERATORS = ('AND', 'OR')
+
+QueryPlan = namedtuple('QueryPlan', ['tokens', 'term_ids', 'weights', 'boolean'])
+
+class QueryAnalyzer:
+    """Analyzer query yang dibangun sekali: stopword, tabel stem, dan cache query plan."""
+
+    def __init__(self, stemmer=None, stop_words=None, stem_table=None, max_cached_queries=MAX_CACHED_QUERIES,
+                 max_stems=MAX_CACHED_STEMS):
+        self._stemmer = stemmer
+        self.stop_words = frozenset(get_stop_words() if stop_words is None else stop_words)
+        self.max_cached_queries = max_cached_queries
+        self.max_stems = max_stems
+        # Tabel stem juga LRU: kata query baru ditambahkan, entri paling lama dibuang
+        self.stem_table = OrderedDict(list((stem_table or {}).items())[-max_stems:])
+        self._token_cache = OrderedDict()
+        self._plan_cache = OrderedDict()
+        self._boolean_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stemmer(self):
+        # Stemmer Sastrawi hanya dibuat jika ada kata yang belum ada di tabel stem
+        if self._stemmer is None:
+            self._stemmer = get_stemmer()
+        return self._stemmer
+
+    def stem(self, token):
+        stem = self._lookup(self.stem_table, token)
+        if stem is None:
+            stem = self.stemmer.stem(token)
+            self._remember(self.stem_table, token, stem, self.max_stems)
+        return stem
+
+    # Akses cache LRU dikunci agar analyzer aman dipakai bersama oleh banyak thread
+    def _lookup(self, cache, key):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _remember(self, cache, key, value, max_size=None):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > (self.max_cached_queries if max_size is None else max_size):
+                cache.popitem(last=False)
+
+    def analyze(self, text):
+        # Hasil sama dengan preprocess_query: tokenisasi -> stopword -> stemming
+        if not text or not text.strip():
+            return []
+        tokens = self._lookup(self._token_cache, text)
+        if tokens is None:
+            tokens = [self.stem(t) for t in tokenize_text(text) if t not in self.stop_words]
+            self._remember(self._token_cache, text, tokens)
+        return list(tokens)
+
+    def boolean_plan(self, text):
+        # Plan Boolean tidak bergantung pada index, sehingga di-cache terpisah dari compile();
+        # disimpan dalam tuple karena plan None (query tidak dikenali) juga perlu di-cache
+        cached = self._lookup(self._boolean_cache, text)
+        if cached is None:
+            cached = (compile_boolean_plan(self.analyze(text)),)
+            self._remember(self._boolean_cache, text, cached)
+        return cached[0]
+
+    def compile(self, text, term_to_idx, idf_vector):
+        # Plan di-cache per (index, query). Entri menyimpan index-nya sendiri dan dicek dengan 'is',
+        # sehingga plan untuk index lain tidak pernah dikembalikan walau id() dipakai ulang
+        cache_key = (id(term_to_idx), text)
+        cached = self._lookup(self._plan_cache, cache_key)
+        if cached is not None and cached[0] is term_to_idx:
+            return cached[1]
+
+        tokens = self.analyze(text)
+        term_ids, weights = [], []
+        for term, count in Counter(t.lower() for t in tokens).items():
+            if term in term_to_idx:
+                term_idx = term_to_idx[term]
+                term_ids.append(term_idx)
+                weights.append((1 + np.log10(count)) * idf_vector[term_idx])
+
+        plan = QueryPlan(
+            tokens=tuple(tokens),
+            term_ids=np.array(term_ids, dtype=np.int64),
+            weights=np.array(weights, dtype=np.float64),
+            boolean=self.boolean_plan(text),
+        )
+        self._remember(self._plan_cache, cache_key, (term_to_idx, plan))
+        return plan
+
+def compile_boolean_plan(tokens):
+    # Aturan sama dengan boolean_retrieve: 'NOT t', 't1 AND/OR t2', atau satu term
+    if len(tokens) == 1:
+        return ('TERM', tokens[0])
+    if len(tokens) == 2 and tokens[0].upper() == 'NOT':
+        return ('NOT', tokens[1])
+    if len(tokens) == 3 and tokens[1].upper() in BOOLEAN_OPERATORS:
+        return (tokens[1].upper(), tokens[0], tokens[2])
+    return None
+
+def plan_to_tfidf_vector(plan, n_terms):
+    # Setara dengan query_to_tfidf_vector: vektor kolom (V x 1) untuk rank_documents
+    cols = np.zeros(plan.term_ids.size, dtype=np.int64)
+    return csr_matrix((plan.weights, (plan.term_ids, cols)), shape=(n_terms, 1))
+
+_shared_analyzer = None
+
+def get_query_analyzer():
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        # Tabel stem diisi awal dari cache preprocessing agar query umum tidak perlu Sastrawi
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        stems_file = os.path.join(current_dir, '..', 'data_processed', STEMS_FILENAME)
+        stem_table = load_stem_table(stems_file, get_stemmer_version())
+        _shared_analyzer = QueryAnalyzer(stem_table=stem_table)
+    return _shared_analyzer
@@ -1,32 +1,60 @@
-import os
 import time
-from preprocess import initialize_preprocessing, preprocess_query
-from vsm_ir import load_processed_documents, calculate_tf_idf, query_to_tfidf_vector, rank_documents
+START_TIME = time.perf_counter()
+
+import os
+import argparse
+from lazy_import import profile_import, print_startup_report
+
+with profile_import("query_analyzer"):
+    from query_analyzer import get_query_analyzer, plan_to_tfidf_vector
+with profile_import("vsm_ir"):
+    from vsm_ir import load_processed_documents, calculate_tf_idf, rank_top_k, BLOCK_SIZE
+with profile_import("corpus_store"):
+    from corpus_store import CORPUS_FILENAME, is_corpus_stale, load_binary_corpus, calculate_tf_idf_from_binary
 
 PROCESSED_DIR = "data_processed"
 K_TOP = 5  
 
-def cli():
+def cli(profile_startup=False, n_threads=1, block_size=BLOCK_SIZE):
     print("SISTEM TEMU KEMBALI INFORMASI (STKI) - VSM Search [REAL MODEL]")
     print("---------------------------------------------------------------")
 
     start_time = time.time()
     
-    stemmer, stop_words = initialize_preprocessing()
-
-    docs, doc_map, vocabulary, raw_text_map = load_processed_documents(PROCESSED_DIR)
-    if not docs:
+    analyzer = get_query_analyzer()
+
+    corpus_path = os.path.join(PROCESSED_DIR, CORPUS_FILENAME)
+    use_binary = os.path.isdir(PROCESSED_DIR) and not is_corpus_stale(PROCESSED_DIR, corpus_path)
+    if os.path.exists(corpus_path) and not use_binary:
+        print(f"⚠️ {CORPUS_FILENAME} tidak sesuai dengan file CLEAN_*.txt, memakai file CLEAN_*.txt.")
+    if use_binary:
+        # Hanya nama dokumen dan vocabulary; token dibaca langsung sebagai term ID
+        corpus = load_binary_corpus(corpus_path)
+        doc_map = {f"D{j+1}": name for j, name in enumerate(corpus['doc_names'])}
+        vocabulary = corpus['vocabulary']
+    else:
+        docs, doc_map, vocabulary, raw_text_map = load_processed_documents(PROCESSED_DIR)
+    if not doc_map:
         print("⚠️ Folder 'data_processed' kosong atau belum dibuat. Jalankan preprocess.py dulu.")
         return
 
-    tfidf_matrix_doc, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(docs, vocabulary)
+    if use_binary:
+        tfidf_matrix_doc, idf_vector, term_to_idx, doc_ids = calculate_tf_idf_from_binary(corpus)
+    else:
+        tfidf_matrix_doc, idf_vector, term_to_idx, doc_ids = calculate_tf_idf(docs, vocabulary)
 
-    print(f"\n✅ Inisialisasi selesai ({len(docs)} dokumen, {len(vocabulary)} term).")
+    print(f"\n✅ Inisialisasi selesai ({len(doc_map)} dokumen, {len(vocabulary)} term).")
     print(f"Ukuran TF-IDF matrix: {tfidf_matrix_doc.shape}")
     print(f"Waktu inisialisasi: {time.time() - start_time:.2f} detik.")
+    if n_threads > 1:
+        print(f"Skoring paralel: {n_threads} thread, blok {block_size} dokumen.")
     print("Ketik 'exit' untuk keluar.")
     print("---------------------------------------------------------------")
 
+    first_prompt_time = time.perf_counter()
+    if profile_startup:
+        print_startup_report(first_prompt_time, START_TIME)
+
     while True:
         query_str = input("\nMasukkan query (ketik 'exit' untuk keluar): ").strip()
 
@@ -38,16 +66,17 @@ def cli():
             print("⚠️ Query tidak boleh kosong.")
             continue
 
-        processed_query_tokens = preprocess_query(query_str, stemmer, stop_words)
+        plan = analyzer.compile(query_str, term_to_idx, idf_vector)
+        processed_query_tokens = list(plan.tokens)
         if not processed_query_tokens:
             print("⚠️ Query hanya berisi stopword atau tidak valid. Coba kata lain.")
             continue
 
         print(f"Query terproses: {processed_query_tokens}")
 
-        query_vector = query_to_tfidf_vector(" ".join(processed_query_tokens), term_to_idx, idf_vector)
+        query_vector = plan_to_tfidf_vector(plan, len(term_to_idx))
 
-        ranking = rank_documents(query_vector, tfidf_matrix_doc, doc_ids)
+        ranking = rank_top_k(query_vector, tfidf_matrix_doc, doc_ids, None, n_threads, block_size)
 
         print("\n--- Hasil Pencarian (Top 5) ---")
         print(f"{'Rank':<5}{'Doc ID':<8}{'Score':<10}{'Dokumen':<40}")
@@ -78,4 +107,9 @@ def cli():
             break
 
 if __name__ == "__main__":
-    cli()
+    parser = argparse.ArgumentParser(description="Pencarian VSM interaktif.")
+    parser.add_argument('--profile-startup', action='store_true')
+    parser.add_argument('--threads', type=int, default=1, help="Jumlah thread skoring (1 = serial)")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help="Jumlah dokumen per blok skoring paralel")
+    args = parser.parse_args()
+    cli(profile_startup=args.profile_startup, n_threads=args.threads, block_size=args.block_size)
@@ -1,13 +1,21 @@
 import os
+import threading
 import numpy as np
 from collections import Counter
-from scipy.sparse import csr_matrix
-from sklearn.metrics.pairwise import cosine_similarity
+from concurrent.futures import ThreadPoolExecutor
+from scipy.sparse import csr_matrix, csc_matrix
+from corpus_store import CORPUS_FILENAME, is_corpus_stale, load_documents_from_binary
 
 PROCESSED_DIR = 'data_processed'
 K_TOP = 5 
+N_THREADS = os.cpu_count() or 1
+BLOCK_SIZE = 65536
 
 def load_processed_documents(directory):
+    # Korpus biner dipakai jika masih sesuai dengan file CLEAN_*.txt; jika tidak, baca per file
+    if not is_corpus_stale(directory):
+        return load_documents_from_binary(os.path.join(directory, CORPUS_FILENAME))
+
     documents = {}
     doc_id_map = {}
     raw_text_map = {}
@@ -68,7 +76,8 @@ def calculate_tf_idf(documents, vocabulary):
     tf_matrix = csr_matrix((tf_matrix_data, (tf_matrix_rows, tf_matrix_cols)), 
                            shape=(len(vocabulary), N))
 
-    tfidf_matrix = tf_matrix.multiply(idf_vector[:, np.newaxis])
+    # CSC: setiap dokumen adalah satu kolom yang tersimpan berurutan
+    tfidf_matrix = tf_matrix.multiply(idf_vector[:, np.newaxis]).tocsc()
     
     return tfidf_matrix, idf_vector, term_to_idx, doc_ids
 
@@ -90,13 +99,97 @@ def query_to_tfidf_vector(query_str, term_to_idx, idf_vector):
 
     return csr_matrix(query_vector).transpose()
 
+def column_block(tfidf_csc, start, end):
+    # Potongan kolom [start, end) dari matriks CSC tanpa menyalin data dan indices
+    p0, p1 = tfidf_csc.indptr[start], tfidf_csc.indptr[end]
+    return csc_matrix(
+        (tfidf_csc.data[p0:p1], tfidf_csc.indices[p0:p1], tfidf_csc.indptr[start:end + 1] - p0),
+        shape=(tfidf_csc.shape[0], end - start),
+    )
+
+def _dense_query(query_vector):
+    query_dense = np.asarray(query_vector.todense()).ravel()
+    return query_dense, np.sqrt(np.dot(query_dense, query_dense))
+
+def _block_cosine(block, query_dense, query_norm):
+    # Semua operasi per kolom, sehingga skor satu dokumen tidak bergantung pada pembagian blok
+    dots = block.transpose() @ query_dense
+    col_ids = np.repeat(np.arange(block.shape[1]), np.diff(block.indptr))
+    doc_norms = np.sqrt(np.bincount(col_ids, weights=block.data ** 2, minlength=block.shape[1]))
+
+    denominators = doc_norms * query_norm
+    similarities = np.zeros(block.shape[1], dtype=np.float64)
+    np.divide(dots, denominators, out=similarities, where=denominators > 0)
+    return similarities
+
+def cosine_similarities(query_vector, tfidf_matrix_doc):
+    # Cosine similarity query (V x 1) terhadap setiap kolom dokumen, tanpa sklearn
+    query_dense, query_norm = _dense_query(query_vector)
+    return _block_cosine(tfidf_matrix_doc.tocsc(), query_dense, query_norm)
+
 def rank_documents(query_vector, tfidf_matrix_doc, doc_ids):
-    similarities = cosine_similarity(query_vector.transpose(), tfidf_matrix_doc.transpose())[0]
+    similarities = cosine_similarities(query_vector, tfidf_matrix_doc)
     
     ranking = sorted(zip(doc_ids, similarities), key=lambda x: x[1], reverse=True)
     
     return ranking
 
+def _top_k_stable(scores, k):
+    # Urutan skor menurun, skor sama diurutkan menurut posisi kolom (sama dengan sorted() yang stabil)
+    if k is not None and k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k is None or k >= scores.size:
+        return np.argsort(-scores, kind='stable')
+    threshold = np.partition(scores, scores.size - k)[scores.size - k]
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - above.size]
+    candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _get_executor(n_threads):
+    # Pool dibuat di bawah lock agar query bersamaan tidak membuat pool ganda
+    with _executors_lock:
+        if n_threads not in _executors:
+            _executors[n_threads] = ThreadPoolExecutor(max_workers=n_threads)
+        return _executors[n_threads]
+
+def rank_documents_parallel(query_vector, tfidf_matrix_doc, doc_ids, k=None, n_threads=N_THREADS, block_size=BLOCK_SIZE):
+    # Hasil identik dengan rank_documents(...)[:k]; kernel sparse/numpy melepas GIL
+    if k is not None and k <= 0:
+        return []
+    tfidf_csc = tfidf_matrix_doc.tocsc()
+    query_dense, query_norm = _dense_query(query_vector)
+    n_docs = tfidf_csc.shape[1]
+    bounds = [(start, min(start + block_size, n_docs)) for start in range(0, n_docs, block_size)]
+
+    def score_block(start_end):
+        start, end = start_end
+        similarities = _block_cosine(column_block(tfidf_csc, start, end), query_dense, query_norm)
+        top = _top_k_stable(similarities, k)
+        return start + top, similarities[top]
+
+    if n_threads <= 1 or len(bounds) <= 1:
+        results = [score_block(b) for b in bounds]
+    else:
+        results = list(_get_executor(n_threads).map(score_block, bounds))
+    if not results:
+        return []
+
+    columns = np.concatenate([cols for cols, _ in results])
+    scores = np.concatenate([sims for _, sims in results])
+    top = _top_k_stable(scores, k)
+    return [(doc_ids[columns[i]], scores[i]) for i in top]
+
+def rank_top_k(query_vector, tfidf_matrix_doc, doc_ids, k=K_TOP, n_threads=1, block_size=BLOCK_SIZE):
+    # n_threads > 1 memakai skoring paralel per blok kolom; k=None mengembalikan ranking penuh
+    if n_threads > 1:
+        return rank_documents_parallel(query_vector, tfidf_matrix_doc, doc_ids, k, n_threads, block_size)
+    ranking = rank_documents(query_vector, tfidf_matrix_doc, doc_ids)
+    return ranking if k is None else ranking[:max(k, 0)]
+
 def calculate_map_and_precision_at_k(ranking, gold_set, k):
     retrieved_at_k = [doc_id for doc_id, score in ranking[:k]]
     relevant_set = set(gold_set)